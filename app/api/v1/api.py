@@ -1,7 +1,8 @@
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from .endpoints import prayer, torah, practical
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 api_router.include_router(prayer.router, prefix="/prayer", tags=["prayer"])
 api_router.include_router(torah.router, prefix="/torah", tags=["torah"])
@@ -1,52 +1,91 @@
 from fastapi import APIRouter
-from datetime import datetime, timedelta
-from typing import Dict, Any
+from datetime import datetime, timedelta, date as date_type
+from typing import Dict, Any, List
+from pydantic import BaseModel
 
 router = APIRouter()
 
-@router.get("/shabbat-preparation")
+class ChallahReminder(BaseModel):
+    bake_by: date_type
+    cover_reminder: bool
+    blessing_reminder: bool
+
+class CandleLighting(BaseModel):
+    time: str
+    blessing_reminder: bool
+
+class ShabbatPreparation(BaseModel):
+    date: date_type
+    challah_reminder: ChallahReminder
+    candle_lighting: CandleLighting
+    practical_tips: List[str]
+
+class FoodPreparation(BaseModel):
+    eat_heavy_meal: bool
+    time: str
+
+class FastPreparation(BaseModel):
+    fast_name: str
+    hydration_reminder: bool
+    food_preparation: FoodPreparation
+    practical_tips: List[str]
+
+# Static parts of the responses, shared across requests
+CHALLAH_REMINDER = {
+    "cover_reminder": True,
+    "blessing_reminder": True
+}
+
+CANDLE_LIGHTING = {
+    "time": "18:00",
+    "blessing_reminder": True
+}
+
+SHABBAT_TIPS = (
+    "Prepare enough food for all meals",
+    "Set up Shabbat table",
+    "Prepare kiddush wine and cups",
+    "Check candle lighting time"
+)
+
+FAST_PREPARATION = {
+    "hydration_reminder": True,
+    "food_preparation": {
+        "eat_heavy_meal": True,
+        "time": "1-2 hours before fast"
+    },
+    "practical_tips": (
+        "Drink plenty of water before fast",
+        "Avoid salty foods before fast",
+        "Plan break-fast meal",
+        "Know exact fast times"
+    )
+}
+
+@router.get("/shabbat-preparation", response_model=ShabbatPreparation)
 async def get_shabbat_preparation() -> Dict[str, Any]:
     """
     Get Shabbat preparation reminders
     """
-    current_date = datetime.now()
+    current_date = datetime.now().date()
     preparation_data = {
-        "date": current_date.strftime("%Y-%m-%d"),
+        "date": current_date,
         "challah_reminder": {
-            "bake_by": (current_date + timedelta(days=1)).strftime("%Y-%m-%d"),
-            "cover_reminder": True,
-            "blessing_reminder": True
+            "bake_by": current_date + timedelta(days=1),
+            **CHALLAH_REMINDER
         },
-        "candle_lighting": {
-            "time": "18:00",
-            "blessing_reminder": True
-        },
-        "practical_tips": [
-            "Prepare enough food for all meals",
-            "Set up Shabbat table",
-            "Prepare kiddush wine and cups",
-            "Check candle lighting time"
-        ]
+        "candle_lighting": CANDLE_LIGHTING,
+        "practical_tips": SHABBAT_TIPS
     }
     return preparation_data
 
-@router.get("/fast-preparation")
+@router.get("/fast-preparation", response_model=FastPreparation)
 async def get_fast_preparation(fast_name: str) -> Dict[str, Any]:
     """
     Get preparation guidelines for upcoming fasts
     """
     preparation_data = {
         "fast_name": fast_name,
-        "hydration_reminder": True,
-        "food_preparation": {
-            "eat_heavy_meal": True,
-            "time": "1-2 hours before fast"
-        },
-        "practical_tips": [
-            "Drink plenty of water before fast",
-            "Avoid salty foods before fast",
-            "Plan break-fast meal",
-            "Know exact fast times"
-        ]
+        **FAST_PREPARATION
     }
     return preparation_data
@@ -1,40 +1,52 @@
-from fastapi import APIRouter
-from datetime import datetime
-from astral import LocationInfo
-from astral.sun import sun
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime, date as date_type
+from pydantic import BaseModel
 from pytz import timezone
+from app.utils.astronomy import calculate_prayer_times, is_in_israel
 
 router = APIRouter()
 
-@router.get("/daily-schedule")
+class PrayerTimes(BaseModel):
+    alos: str
+    sunrise: str
+    talit: str
+    shacharit: str
+    mincha_gedola: str
+    mincha_ketana: str
+    plag_hamincha: str
+    sunset: str
+    tzeit_hakochavim: str
+
+class DailyPrayerSchedule(BaseModel):
+    date: date_type
+    prayer_times: PrayerTimes
+
+class TefillinSchedule(BaseModel):
+    date: date_type
+    tefillin_allowed: bool
+    start_time: str
+    end_time: str
+
+@router.get("/daily-schedule", response_model=DailyPrayerSchedule)
 async def get_daily_prayer_schedule(latitude: float, longitude: float, date: str = None):
     """
     Get daily prayer times based on location
     """
+    if not is_in_israel(latitude, longitude):
+        raise HTTPException(status_code=400, detail="Prayer times are only available for locations in Israel")
+    
     if date is None:
         date = datetime.now()
     else:
-        date = datetime.strptime(date, "%Y-%m-%d")
-    
-    city = LocationInfo("Custom Location", "", "Asia/Jerusalem", latitude, longitude)
-    s = sun(city.observer, date=date)
+        date = datetime.fromisoformat(date)
     
     return {
-        "date": date.strftime("%Y-%m-%d"),
-        "prayer_times": {
-            "alos": s.dawn().strftime("%H:%M"),
-            "sunrise": s.sunrise().strftime("%H:%M"),
-            "talit": s.sunrise().strftime("%H:%M"),
-            "shacharit": s.sunrise().strftime("%H:%M"),
-            "mincha_gedola": s.sunset().strftime("%H:%M"),
-            "mincha_ketana": s.sunset().strftime("%H:%M"),
-            "plag_hamincha": s.sunset().strftime("%H:%M"),
-            "sunset": s.sunset().strftime("%H:%M"),
-            "tzeit_hakochavim": s.dusk().strftime("%H:%M"),
-        }
+        "date": date.date(),
+        "prayer_times": await run_in_threadpool(calculate_prayer_times, date, latitude, longitude)
     }
 
-@router.get("/tefillin")
+@router.get("/tefillin", response_model=TefillinSchedule)
 async def get_tefillin_schedule(latitude: float, longitude: float, date: str = None):
     """
     Get tefillin wearing times
@@ -42,11 +54,11 @@ async def get_tefillin_schedule(latitude: float, longitude: float, date: str = N
     if date is None:
         date = datetime.now()
     else:
-        date = datetime.strptime(date, "%Y-%m-%d")
+        date = datetime.fromisoformat(date)
     
     # TODO: Add logic for Chol Hamoed, Yom Tov, etc.
     return {
-        "date": date.strftime("%Y-%m-%d"),
+        "date": date.date(),
         "tefillin_allowed": True,
         "start_time": "07:00",
         "end_time": "13:00"
@@ -1,9 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.utils.sefaria import sefaria_api
 
-app = FastAPI(title="Jewish Spirituality App", version="1.0.0")
+app = FastAPI(title="Jewish Spirituality App", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -15,3 +17,11 @@ app.add_middleware(
 )
 
 app.include_router(api_router, prefix="/api/v1")
+
+@app.on_event("startup")
+async def startup() -> None:
+    await sefaria_api.open()
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await sefaria_api.close()
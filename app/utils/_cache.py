@@ -0,0 +1,27 @@
+import os
+from typing import Dict
+from cachetools import Cache, LRUCache, TTLCache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CACHE_MAX_SIZE = int(os.getenv('CACHE_MAX_SIZE', 1000))
+CACHE_TTL = int(os.getenv('CACHE_TTL', 3600))
+
+_caches: Dict[str, Cache] = {}
+
+def make_cache(name: str) -> TTLCache:
+    """
+    Get the shared TTL cache registered under the given name
+    """
+    if name not in _caches:
+        _caches[name] = TTLCache(maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL)
+    return _caches[name]
+
+def make_lru_cache(name: str) -> LRUCache:
+    """
+    Get the shared non-expiring LRU cache registered under the given name
+    """
+    if name not in _caches:
+        _caches[name] = LRUCache(maxsize=CACHE_MAX_SIZE)
+    return _caches[name]
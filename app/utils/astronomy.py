@@ -1,22 +1,95 @@
-from datetime import datetime
+from datetime import datetime, date as date_type
 from typing import Dict, Any
 from ephem import *
-from pytz import timezone
+from pytz import timezone, utc
 from astral import LocationInfo
 from astral.sun import sun
-import os
-from dotenv import load_dotenv
-from cachetools import TTLCache
 from functools import lru_cache
+import threading
+from app.utils._cache import make_cache
 from app.utils.visualizations import moon_visualizer, tide_visualizer
 
-load_dotenv()
+MAZALOT = (
+    "Aries", "Taurus", "Gemini", "Cancer",
+    "Leo", "Virgo", "Libra", "Scorpio",
+    "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+)
+
+MOON_PHASES = (
+    "New Moon", "Waxing Crescent", "First Quarter",
+    "Waxing Gibbous", "Full Moon", "Waning Gibbous",
+    "Last Quarter", "Waning Crescent"
+)
+
+# Mean length of a lunation and a known new moon (2000-01-06 18:14 UT) as a Julian day
+SYNODIC_MONTH = 29.530588853
+REFERENCE_NEW_MOON_JD = 2451550.26
+
+# Times are given in Israel time, so only coordinates in and around Israel are supported
+ISRAEL_LATITUDES = (29.4, 33.4)
+ISRAEL_LONGITUDES = (34.2, 35.95)
+
+def is_in_israel(latitude: float, longitude: float) -> bool:
+    """
+    Check whether coordinates fall within the supported Israel region
+    """
+    return (ISRAEL_LATITUDES[0] <= latitude <= ISRAEL_LATITUDES[1]
+            and ISRAEL_LONGITUDES[0] <= longitude <= ISRAEL_LONGITUDES[1])
+
+@lru_cache(maxsize=1024)
+def _prayer_times_cached(day: date_type, latitude: float, longitude: float) -> Dict[str, str]:
+    """
+    Compute and format the prayer times for one day at one location
+    """
+    location = LocationInfo("Custom Location", "", "Asia/Jerusalem", latitude, longitude)
+    s = sun(location.observer, date=day, tzinfo=location.tzinfo)
+    dawn = s["dawn"].strftime("%H:%M")
+    sunrise = s["sunrise"].strftime("%H:%M")
+    sunset = s["sunset"].strftime("%H:%M")
+    dusk = s["dusk"].strftime("%H:%M")
+    return {
+        "alos": dawn,
+        "sunrise": sunrise,
+        "talit": sunrise,
+        "shacharit": sunrise,
+        "mincha_gedola": sunset,
+        "mincha_ketana": sunset,
+        "plag_hamincha": sunset,
+        "sunset": sunset,
+        "tzeit_hakochavim": dusk
+    }
+
+def calculate_prayer_times(date: datetime, latitude: float, longitude: float) -> Dict[str, str]:
+    """
+    Calculate prayer times in Israel time for the given date and location
+    """
+    if not is_in_israel(latitude, longitude):
+        raise ValueError("Prayer times are only available for locations in Israel")
+    # Round to ~10m so nearby coordinates share a cache entry
+    return _prayer_times_cached(date.date(), round(latitude, 4), round(longitude, 4))
 
 class AstronomyCalculator:
     def __init__(self):
-        self.cache = TTLCache(maxsize=int(os.getenv('CACHE_MAX_SIZE', 1000)), ttl=int(os.getenv('CACHE_TTL', 3600)))
+        self.cache = make_cache("astronomy")
         self.israel_tz = timezone('Asia/Jerusalem')
-        self.location = LocationInfo("Jerusalem", "Israel")
+        self._planets = {
+            "sun": Sun(),
+            "moon": Moon(),
+            "mercury": Mercury(),
+            "venus": Venus(),
+            "mars": Mars(),
+            "jupiter": Jupiter(),
+            "saturn": Saturn()
+        }
+        # Observer for the default Jerusalem location
+        self._default_location = (31.7683, 35.2137)
+        self._observer = Observer()
+        self._observer.lat = "31.7683"
+        self._observer.lon = "35.2137"
+        # The bodies and observer above are shared across requests handled in worker threads
+        self._lock = threading.Lock()
+        # cachetools caches are not thread-safe, so reads and writes share their own lock
+        self._cache_lock = threading.Lock()
 
     def get_moon_visual(self, phase: float, phase_name: str) -> Dict[str, Any]:
         """
@@ -34,101 +107,91 @@ class AstronomyCalculator:
         """
         Get comprehensive astronomical data for a given date and location
         """
-        # Check cache first
-        cache_key = f"{date.strftime('%Y-%m-%d')}_{latitude}_{longitude}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        # Convert to Israel time
+        date = date.astimezone(self.israel_tz)
+
+        # Check cache first, keyed on the day and ~10m of position so repeat calls hit
+        cache_key = (date.toordinal(), round(latitude, 4), round(longitude, 4))
+        with self._cache_lock:
+            cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
-            # Convert to Israel time
-            date = date.astimezone(self.israel_tz)
-            
-            # Set up observer
-            observer = Observer()
-            observer.lat = str(latitude)
-            observer.lon = str(longitude)
-            observer.date = date.strftime('%Y/%m/%d')
-
-            # Calculate moon data
-            moon = Moon()
-            moon.compute(observer)
-            moon_phase = self._calculate_moon_phase(moon.phase)
-            
-            # Calculate sun data
-            sun = Sun()
-            sun.compute(observer)
-            
-            # Calculate zodiac positions
-            zodiac_positions = self._calculate_zodiac_positions(date)
+            with self._lock:
+                # Set up observer
+                if (latitude, longitude) == self._default_location:
+                    observer = self._observer
+                else:
+                    observer = Observer()
+                    observer.lat = str(latitude)
+                    observer.lon = str(longitude)
+                observer.date = date.strftime('%Y/%m/%d')
+                
+                # Calculate zodiac positions, which also computes the sun and moon
+                zodiac_positions = self._calculate_zodiac_positions(observer)
+                
+                # Calculate moon data
+                moon = self._planets["moon"]
+                moon_data = {
+                    "phase": self._calculate_moon_phase(moon.phase, date),
+                    "position": moon.alt,
+                    "constellation": self._get_mazal(moon.alt)
+                }
+                
+                # Calculate sun data
+                sun = self._planets["sun"]
+                sun_data = {
+                    "position": sun.alt,
+                    "constellation": self._get_mazal(sun.alt)
+                }
             
             # Calculate prayer times
             prayer_times = self._calculate_prayer_times(date, latitude, longitude)
             
             result = {
                 "date": date.strftime("%Y-%m-%d"),
-                "moon": {
-                    "phase": moon_phase,
-                    "position": moon.alt,
-                    "constellation": self._get_mazal(moon.alt)
-                },
-                "sun": {
-                    "position": sun.alt,
-                    "constellation": self._get_mazal(sun.alt)
-                },
+                "moon": moon_data,
+                "sun": sun_data,
                 "zodiac_positions": zodiac_positions,
                 "prayer_times": prayer_times,
                 "astronomical_events": self._get_astronomical_events(date)
             }
             
             # Cache the result
-            self.cache[cache_key] = result
+            with self._cache_lock:
+                self.cache[cache_key] = result
             return result
             
         except Exception as e:
             return {"error": str(e)}
 
-    def _calculate_moon_phase(self, phase: float) -> Dict[str, Any]:
+    def _calculate_moon_phase(self, phase: float, date: datetime) -> Dict[str, Any]:
         """
         Calculate detailed moon phase information
         """
-        phases = [
-            "New Moon", "Waxing Crescent", "First Quarter",
-            "Waxing Gibbous", "Full Moon", "Waning Gibbous",
-            "Last Quarter", "Waning Crescent"
-        ]
-        
         phase_index = int((phase / 100) * 8)
         return {
-            "name": phases[phase_index],
+            "name": MOON_PHASES[phase_index],
             "percentage": phase,
-            "age": self._calculate_moon_age()
+            "age": self._calculate_moon_age(date)
         }
 
-    def _calculate_moon_age(self) -> float:
+    def _calculate_moon_age(self, date: datetime) -> float:
         """
         Calculate moon's age in days
         """
-        new_moon = Moon()
-        new_moon.compute_new_moon()
-        return (datetime.now() - new_moon.date).days
+        date = date.astimezone(utc)
+        jd = date.toordinal() + 1721424.5 + (date.hour + date.minute / 60) / 24
+        return (jd - REFERENCE_NEW_MOON_JD) % SYNODIC_MONTH
 
-    def _calculate_zodiac_positions(self, date: datetime) -> Dict[str, Dict[str, Any]]:
+    def _calculate_zodiac_positions(self, observer: Observer) -> Dict[str, Dict[str, Any]]:
         """
         Calculate positions of all planets in zodiac
         """
-        planets = {
-            "sun": Sun(),
-            "moon": Moon(),
-            "mercury": Mercury(),
-            "venus": Venus(),
-            "mars": Mars(),
-            "jupiter": Jupiter(),
-            "saturn": Saturn()
-        }
-        
         positions = {}
-        for name, planet in planets.items():
-            planet.compute(date)
+        for name, planet in self._planets.items():
+            planet.compute(observer)
             positions[name] = {
                 "constellation": self._get_mazal(planet.alt),
                 "degree": planet.alt,
@@ -141,41 +204,16 @@ class AstronomyCalculator:
         Get the mazal (constellation) for a given position
         """
         # Simplified calculation - in production use proper ephemeris
-        mazalot = [
-            "Aries", "Taurus", "Gemini", "Cancer",
-            "Leo", "Virgo", "Libra", "Scorpio",
-            "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-        ]
-        return mazalot[int(position) % len(mazalot)]
+        return MAZALOT[int(position) % 12]
 
-    def _get_zodiac_sign(self, position: float) -> str:
-        """
-        Get the zodiac sign for a given position
-        """
-        # Simplified calculation - in production use proper ephemeris
-        signs = [
-            "Aries", "Taurus", "Gemini", "Cancer",
-            "Leo", "Virgo", "Libra", "Scorpio",
-            "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-        ]
-        return signs[int(position) % len(signs)]
+    # Zodiac signs and mazalot are the same twelve constellations
+    _get_zodiac_sign = _get_mazal
 
     def _calculate_prayer_times(self, date: datetime, latitude: float, longitude: float) -> Dict[str, str]:
         """
         Calculate prayer times for the given location
         """
-        s = sun(self.location.observer, date=date)
-        return {
-            "alos": s.dawn().strftime("%H:%M"),
-            "sunrise": s.sunrise().strftime("%H:%M"),
-            "talit": s.sunrise().strftime("%H:%M"),
-            "shacharit": s.sunrise().strftime("%H:%M"),
-            "mincha_gedola": s.sunset().strftime("%H:%M"),
-            "mincha_ketana": s.sunset().strftime("%H:%M"),
-            "plag_hamincha": s.sunset().strftime("%H:%M"),
-            "sunset": s.sunset().strftime("%H:%M"),
-            "tzeit_hakochavim": s.dusk().strftime("%H:%M")
-        }
+        return calculate_prayer_times(date, latitude, longitude)
 
     def _get_astronomical_events(self, date: datetime) -> list:
         """
@@ -1,62 +1,77 @@
-from datetime import datetime
-from typing import Dict, Any
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Set
+from functools import lru_cache
 from hebrewcal import HebrewDate
+from hebrewcal.names import hebrew_month_name, weekday_name
+from hebrewcal.numerals import to_hebrew_numeral
+from hebrewcal.religious.holidays import holidays
 from pytz import timezone
 from dateutil import parser
-from cachetools import TTLCache
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+from app.utils.astronomy import MAZALOT
 
 class HebrewDateCalculator:
     def __init__(self):
-        self.cache = TTLCache(maxsize=int(os.getenv('CACHE_MAX_SIZE', 1000)), ttl=int(os.getenv('CACHE_TTL', 3600)))
         self.israel_tz = timezone('Asia/Jerusalem')
 
     def get_hebrew_date(self, date: datetime) -> Dict[str, Any]:
         """
         Get complete Hebrew date information for a given date
         """
-        # Check cache first
-        cache_key = date.strftime("%Y-%m-%d")
-        if cache_key in self.cache:
-            return self.cache[cache_key]
-
         try:
             # Convert to Israel time
             date = date.astimezone(self.israel_tz)
+            return self._year_table(date.year)[date.timetuple().tm_yday - 1]
             
-            # Get Hebrew date
-            hebrew_date = HebrewDate.from_gregorian(date.year, date.month, date.day)
-            
-            # Calculate Omer day
-            omer_day = self._calculate_omer_day(date)
-            
-            # Check for holidays
-            is_holiday = self._is_holiday(date)
-            
-            # Get zodiac information
-            zodiac = self._get_zodiac(date)
-            
-            result = {
+        except Exception as e:
+            return {"error": str(e)}
+
+    @lru_cache(maxsize=4)
+    def _year_table(self, year: int) -> List[Dict[str, Any]]:
+        """
+        Build the Hebrew date information for every day of a Gregorian year
+        """
+        # A Gregorian year overlaps two Hebrew years, so collect the holidays of both once
+        try:
+            first = HebrewDate.from_rd(datetime(year, 1, 1).toordinal()).year
+            holiday_dates = {
+                holiday.date
+                for hebrew_year in (first, first + 1)
+                for holiday in holidays(hebrew_year, diaspora=False)
+            }
+        except Exception:
+            # Still build the table; is_holiday is unknown for every day
+            holiday_dates = None
+        
+        table = []
+        date = datetime(year, 1, 1)
+        while date.year == year:
+            table.append(self._build_day(date, holiday_dates))
+            date += timedelta(days=1)
+        return table
+
+    def _build_day(self, date: datetime, holiday_dates: Optional[Set[HebrewDate]]) -> Dict[str, Any]:
+        """
+        Build the Hebrew date information for one day, or an error entry if it fails
+        """
+        try:
+            # hebrewcal counts days in Rata Die, which matches the proleptic Gregorian ordinal
+            hebrew_date = HebrewDate.from_rd(date.toordinal())
+            return {
                 "gregorian_date": date.strftime("%Y-%m-%d"),
                 "hebrew_day": hebrew_date.day,
                 "hebrew_month": hebrew_date.month,
                 "hebrew_year": hebrew_date.year,
-                "hebrew_month_name": hebrew_date.month_name,
-                "hebrew_year_name": hebrew_date.year_name,
-                "is_holiday": is_holiday,
-                "omer_day": omer_day,
-                "zodiac_sign": zodiac,
-                "day_of_week": hebrew_date.day_of_week,
-                "parsha": self._get_parsha(date)
+                "hebrew_month_name": hebrew_month_name(hebrew_date.year, hebrew_date.month),
+                "hebrew_year_name": to_hebrew_numeral(hebrew_date.year),
+                "is_holiday": hebrew_date in holiday_dates if holiday_dates is not None else None,
+                "omer_day": self._calculate_omer_day(date),
+                "zodiac_sign": self._get_zodiac(date),
+                # weekday_name counts from Sunday, datetime.weekday() from Monday
+                "day_of_week": weekday_name((date.weekday() + 1) % 7),
+                # hebrewcal has no parsha table; the weekly parsha comes from Sefaria
+                "parsha": None
             }
             
-            # Cache the result
-            self.cache[cache_key] = result
-            return result
-            
         except Exception as e:
             return {"error": str(e)}
 
@@ -69,13 +84,6 @@ class HebrewDateCalculator:
         days = (date - pesach_start).days
         return days + 1 if 0 <= days < 49 else None
 
-    def _is_holiday(self, date: datetime) -> bool:
-        """
-        Check if the date is a Jewish holiday
-        """
-        hebrew_date = HebrewDate.from_gregorian(date.year, date.month, date.day)
-        return hebrew_date.is_holiday
-
     def _get_zodiac(self, date: datetime) -> str:
         """
         Get the zodiac sign for the date
@@ -85,19 +93,11 @@ class HebrewDateCalculator:
         
         # Calculate zodiac position
         zodiac_start = (jd - 1) % 12
-        zodiac_signs = [
-            "Aries", "Taurus", "Gemini", "Cancer",
-            "Leo", "Virgo", "Libra", "Scorpio",
-            "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-        ]
-        return zodiac_signs[zodiac_start]
-
-    def _get_parsha(self, date: datetime) -> str:
-        """
-        Get the weekly parsha for the date
-        """
-        hebrew_date = HebrewDate.from_gregorian(date.year, date.month, date.day)
-        return hebrew_date.parsha
+        return MAZALOT[zodiac_start]
 
 # Create a singleton instance
 hebrew_date_calculator = HebrewDateCalculator()
+
+# Build the current year's table at import so the first request doesn't pay for it.
+# Days that fail to convert keep their error entry for the life of the cached table.
+hebrew_date_calculator.get_hebrew_date(datetime.now())
@@ -1,12 +1,14 @@
-import requests
-from typing import Dict, Any, Optional
+import asyncio
+import aiohttp
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 import os
-from dotenv import load_dotenv
-from cachetools import TTLCache
-from functools import lru_cache
+from app.utils._cache import make_cache, make_lru_cache
 
-load_dotenv()
+# Retry transient gateway errors a couple of times with exponential backoff
+RETRY_STATUSES = (502, 503, 504)
+MAX_RETRIES = 2
+BACKOFF_FACTOR = 0.2
 
 class SefariaAPI:
     def __init__(self):
@@ -16,80 +18,109 @@ class SefariaAPI:
             "accept": "application/json",
             "Authorization": f"Bearer {self.api_key}" if self.api_key else None
         }
-        self.text_cache = TTLCache(maxsize=int(os.getenv('CACHE_MAX_SIZE', 1000)), ttl=int(os.getenv('CACHE_TTL', 3600)))
-        self.parsha_cache = TTLCache(maxsize=int(os.getenv('CACHE_MAX_SIZE', 1000)), ttl=int(os.getenv('CACHE_TTL', 3600)))
+        self.text_cache = make_cache("sefaria_text")
+        self.parsha_cache = make_cache("sefaria_parsha")
+        # Pre-bound so a cache hit is a single lookup
+        self._text_get = self.text_cache.__getitem__
+        self._text_set = self.text_cache.__setitem__
+        self._parsha_get = self.parsha_cache.__getitem__
+        self._parsha_set = self.parsha_cache.__setitem__
+        # (etag, body) of past responses, kept after the TTL caches expire them
+        self.validators = make_lru_cache("sefaria_validators")
+        # Text requests currently on the wire, keyed like the text cache
+        self._pending_texts: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.session: Optional[aiohttp.ClientSession] = None
 
-    @lru_cache(maxsize=128)
-    def get_text(self, ref: str, version: str = "English - Metsudah Linear Bible") -> Dict[str, Any]:
+    async def open(self) -> None:
         """
-        Get text from Sefaria by reference with caching
+        Open the pooled HTTP session shared by all Sefaria requests
         """
-        cache_key = f"{ref}_{version}"
-        if cache_key in self.text_cache:
-            return self.text_cache[cache_key]
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=32, limit_per_host=8, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={k: v for k, v in self.headers.items() if v is not None},
+                timeout=aiohttp.ClientTimeout(total=10, connect=3)
+            )
 
-        url = f"{self.base_url}/texts"
-        params = {
-            "ref": ref,
-            "version": version,
-            "context": True
-        }
-        
-        try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            result = response.json()
-            self.text_cache[cache_key] = result
-            return result
-        except requests.RequestException as e:
-            return {"error": str(e)}
+    async def close(self) -> None:
+        """
+        Close the shared HTTP session
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
 
-    @lru_cache(maxsize=32)
-    def get_parsha(self, date: datetime) -> Dict[str, Any]:
+    async def _get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Get the parsha for a given date with caching
+        Issue a GET request on the shared session and decode the JSON body,
+        revalidating any previously seen response with its ETag
         """
-        cache_key = date.strftime("%Y-%m-%d")
-        if cache_key in self.parsha_cache:
-            return self.parsha_cache[cache_key]
+        await self.open()
+        validator_key = (url, tuple(params.items()))
+        stale = self.validators.get(validator_key)
+        headers = {"If-None-Match": stale[0]} if stale else None
 
-        url = f"{self.base_url}/calendar"
-        params = {
-            "date": date.strftime("%Y-%m-%d"),
-            "type": "parsha"
-        }
-        
+        for attempt in range(MAX_RETRIES + 1):
+            async with self.session.get(url, params=params, headers=headers) as response:
+                if response.status == 304 and stale:
+                    return stale[1]
+                if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    response.raise_for_status()
+                    body = await response.json()
+                    etag = response.headers.get("ETag")
+                    if etag:
+                        self.validators[validator_key] = (etag, body)
+                    return body
+            await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+
+    async def get_text(self, ref: str, version: str = "English - Metsudah Linear Bible") -> Dict[str, Any]:
+        """
+        Get text from Sefaria by reference with caching
+        """
+        cache_key = (ref, version)
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            result = response.json()
-            self.parsha_cache[cache_key] = result
-            return result
-        except requests.RequestException as e:
-            return {"error": str(e)}
+            return self._text_get(cache_key)
+        except KeyError:
+            pass
+
+        # Concurrent callers asking for the same text share one request
+        pending = self._pending_texts.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_text(cache_key))
+            self._pending_texts[cache_key] = pending
+            pending.add_done_callback(lambda _: self._pending_texts.pop(cache_key, None))
+        return await asyncio.shield(pending)
 
-    def get_text(self, ref: str, version: str = "English - Metsudah Linear Bible") -> Dict[str, Any]:
+    async def _fetch_text(self, cache_key: Tuple[str, str]) -> Dict[str, Any]:
         """
-        Get text from Sefaria by reference
+        Fetch a text from Sefaria and cache it on success
         """
+        ref, version = cache_key
         url = f"{self.base_url}/texts"
         params = {
             "ref": ref,
             "version": version,
-            "context": True
+            "context": 1
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            result = await self._get_json(url, params)
+            self._text_set(cache_key, result)
+            return result
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
             return {"error": str(e)}
 
-    def get_parsha(self, date: datetime) -> Dict[str, Any]:
+    async def get_parsha(self, date: datetime) -> Dict[str, Any]:
         """
-        Get the parsha for a given date
+        Get the parsha for a given date with caching
         """
+        cache_key = date.toordinal()
+        try:
+            return self._parsha_get(cache_key)
+        except KeyError:
+            pass
+
         url = f"{self.base_url}/calendar"
         params = {
             "date": date.strftime("%Y-%m-%d"),
@@ -97,17 +128,16 @@ class SefariaAPI:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            result = await self._get_json(url, params)
+            self._parsha_set(cache_key, result)
+            return result
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
             return {"error": str(e)}
 
-    def get_kabbalistic_texts(self, ref: str) -> Dict[str, Any]:
+    async def get_kabbalistic_texts(self, ref: str) -> Dict[str, Any]:
         """
         Get Kabbalistic texts related to a reference
         """
-        texts = {}
         kabbalistic_sources = [
             "Zohar",
             "Tanya",
@@ -115,40 +145,35 @@ class SefariaAPI:
             "Ari"
         ]
         
-        for source in kabbalistic_sources:
-            text_ref = f"{source}.{ref}"
-            texts[source.lower()] = self.get_text(text_ref)
-        
-        return texts
+        texts = await asyncio.gather(*(self.get_text(f"{source}.{ref}") for source in kabbalistic_sources))
+        return {source.lower(): text for source, text in zip(kabbalistic_sources, texts)}
 
-    def get_chassidic_texts(self, ref: str) -> Dict[str, Any]:
+    async def get_chassidic_texts(self, ref: str) -> Dict[str, Any]:
         """
         Get Chassidic texts related to a reference
         """
-        texts = {}
         chassidic_sources = [
             "Chabad.org",
             "Tanya",
             "Chassidic Insights"
         ]
         
-        for source in chassidic_sources:
-            text_ref = f"{source}.{ref}"
-            texts[source.lower()] = self.get_text(text_ref)
-        
-        return texts
+        texts = await asyncio.gather(*(self.get_text(f"{source}.{ref}") for source in chassidic_sources))
+        return {source.lower(): text for source, text in zip(chassidic_sources, texts)}
 
-    def get_related_texts(self, ref: str) -> Dict[str, Any]:
+    async def get_related_texts(self, ref: str) -> Dict[str, Any]:
         """
         Get all related texts for a reference
         """
-        return {
-            "rashi": self.get_text(f"Rashi on {ref}"),
-            "midrash": self.get_text(f"Midrash Rabbah.{ref}"),
-            "gemara": self.get_text(f"Gemara.{ref}"),
-            "kabbalistic": self.get_kabbalistic_texts(ref),
-            "chassidic": self.get_chassidic_texts(ref)
-        }
+        keys = ("rashi", "midrash", "gemara", "kabbalistic", "chassidic")
+        texts = await asyncio.gather(
+            self.get_text(f"Rashi on {ref}"),
+            self.get_text(f"Midrash Rabbah.{ref}"),
+            self.get_text(f"Gemara.{ref}"),
+            self.get_kabbalistic_texts(ref),
+            self.get_chassidic_texts(ref)
+        )
+        return dict(zip(keys, texts))
 
 # Create a singleton instance
 sefaria_api = SefariaAPI()
@@ -1,10 +1,21 @@
-import plotly.graph_objects as go
 import numpy as np
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+from functools import lru_cache
 from math import sin, cos, pi
+from pathlib import Path
 import json
 
+# Pre-rendered images written by scripts/render_static_visuals.py
+STATIC_DIR = Path(__file__).resolve().parents[2] / "static"
+TIDE_IMAGE_PATH = STATIC_DIR / "tide.png"
+
+def moon_image_path(phase_name: str) -> Path:
+    """
+    Get the path of the pre-rendered image for a moon phase
+    """
+    return STATIC_DIR / f"moon_{phase_name.lower().replace(' ', '_')}.png"
+
 class MoonVisualization:
     def __init__(self):
         self.phase_colors = {
@@ -17,65 +28,97 @@ class MoonVisualization:
             "Last Quarter": "#808080",
             "Waning Crescent": "#4d4d4d"
         }
+        
+        # Moon outline, reused for every render and kept as plain lists so it serializes directly
+        theta = np.linspace(0, 2*pi, 100)
+        self._x = np.cos(theta).tolist()
+        self._y = np.sin(theta).tolist()
+        
+        # One prebuilt figure per phase name; renders only patch the arc and the label
+        self._templates = {
+            phase_name: self._build_template(phase_name)
+            for phase_name in self.phase_colors
+        }
+
+    def _build_template(self, phase_name: str) -> Dict[str, Any]:
+        """
+        Build the figure for a phase name with an empty illuminated arc
+        """
+        return {
+            "data": [
+                # Moon outline
+                {
+                    "type": "scatter",
+                    "x": self._x,
+                    "y": self._y,
+                    "mode": "lines",
+                    "line": {"color": "black", "width": 2},
+                    "name": "Moon"
+                },
+                # Illuminated portion
+                {
+                    "type": "scatter",
+                    "x": [],
+                    "y": [],
+                    "mode": "lines",
+                    "line": {"color": self.phase_colors[phase_name], "width": 2},
+                    "fill": "toself",
+                    "fillcolor": self.phase_colors[phase_name],
+                    "name": "Illuminated"
+                }
+            ],
+            "layout": {
+                "width": 300,
+                "height": 300,
+                "showlegend": False,
+                "xaxis": {"visible": False},
+                "yaxis": {"visible": False},
+                "margin": {"l": 0, "r": 0, "t": 0, "b": 0},
+                "annotations": [
+                    {
+                        "text": phase_name,
+                        "xref": "paper",
+                        "yref": "paper",
+                        "x": 0.5,
+                        "y": 0.5,
+                        "showarrow": False,
+                        "font": {"size": 14}
+                    }
+                ]
+            }
+        }
 
     def create_moon_visual(self, phase: float, phase_name: str) -> Dict[str, Any]:
         """
         Create a visual representation of the moon phase
         """
-        # Create moon shape
-        theta = np.linspace(0, 2*pi, 100)
-        x = np.cos(theta)
-        y = np.sin(theta)
+        return self._build_moon_visual(round(phase, 1), phase_name)
+
+    @lru_cache(maxsize=64)
+    def _build_moon_visual(self, phase: float, phase_name: str) -> Dict[str, Any]:
+        """
+        Build the moon phase figure from its template, memoized per phase
+        """
+        template = self._templates[phase_name]
+        outline, illuminated_trace = template["data"]
+        annotation = template["layout"]["annotations"][0]
         
-        # Calculate illuminated portion
+        # Calculate illuminated portion as the matching arc of the outline
         illuminated = phase / 100
-        theta_ill = np.linspace(0, 2*pi*illuminated, 50)
-        x_ill = np.cos(theta_ill)
-        y_ill = np.sin(theta_ill)
+        points = int(round(illuminated * (len(self._x) - 1))) + 1
         
-        # Create figure
-        fig = go.Figure()
-        
-        # Add moon outline
-        fig.add_trace(go.Scatter(
-            x=x, y=y,
-            mode='lines',
-            line=dict(color='black', width=2),
-            name='Moon'
-        ))
-        
-        # Add illuminated portion
-        fig.add_trace(go.Scatter(
-            x=x_ill, y=y_ill,
-            mode='lines',
-            line=dict(color=self.phase_colors[phase_name], width=2),
-            fill='toself',
-            fillcolor=self.phase_colors[phase_name],
-            name='Illuminated'
-        ))
-        
-        # Update layout
-        fig.update_layout(
-            width=300,
-            height=300,
-            showlegend=False,
-            xaxis=dict(visible=False),
-            yaxis=dict(visible=False),
-            margin=dict(l=0, r=0, t=0, b=0),
-            annotations=[
-                dict(
-                    text=f"{phase_name}<br>{phase:.1f}%",
-                    xref="paper",
-                    yref="paper",
-                    x=0.5,
-                    y=0.5,
-                    showarrow=False,
-                    font=dict(size=14)
-                )
-            ]
-        )
-        
-        return fig.to_dict()
+        # Copy only the parts that change; the outline and the rest of the layout are shared
+        return {
+            **template,
+            "data": [
+                outline,
+                {**illuminated_trace, "x": self._x[:points], "y": self._y[:points]}
+            ],
+            "layout": {
+                **template["layout"],
+                "annotations": [{**annotation, "text": f"{phase_name}<br>{phase:.1f}%"}]
+            }
+        }
 
 class TideVisualization:
     def __init__(self):
@@ -84,73 +127,78 @@ class TideVisualization:
             "low": "#00cc99",
             "current": "#ff0000"
         }
+        
+        # The 24-hour tide curve is fixed, so build it once as plain lists
+        x = np.linspace(0, 24, 100)
+        y = 1.5 * np.sin(2*pi*x/12) + 1.5 * np.sin(2*pi*x/24)  # Combines diurnal and semidiurnal tides
+        self._x = x.tolist()
+        self._y = y.tolist()
+        self._high_tide = float(y.max())
+        self._low_tide = float(y.min())
 
     def create_tide_visual(self, tide_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a visualization of tide patterns
         """
-        # Generate x-axis (time)
-        x = np.linspace(0, 24, 100)
-        
-        # Generate y-axis (tide height)
-        y = 1.5 * np.sin(2*pi*x/12) + 1.5 * np.sin(2*pi*x/24)  # Combines diurnal and semidiurnal tides
-        
-        # Create figure
-        fig = go.Figure()
-        
-        # Add tide line
-        fig.add_trace(go.Scatter(
-            x=x,
-            y=y,
-            mode='lines',
-            line=dict(color='#0066cc', width=2),
-            name='Tide Level'
-        ))
-        
-        # Add high and low tide markers
-        high_tide = max(y)
-        low_tide = min(y)
-        
-        fig.add_trace(go.Scatter(
-            x=[0, 24],
-            y=[high_tide, high_tide],
-            mode='lines',
-            line=dict(color=self.tide_colors["high"], dash='dash'),
-            name='High Tide'
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=[0, 24],
-            y=[low_tide, low_tide],
-            mode='lines',
-            line=dict(color=self.tide_colors["low"], dash='dash'),
-            name='Low Tide'
-        ))
-        
-        # Add current time marker
-        current_time = datetime.now().hour
-        current_tide = 1.5 * np.sin(2*pi*current_time/12) + 1.5 * np.sin(2*pi*current_time/24)
-        
-        fig.add_trace(go.Scatter(
-            x=[current_time],
-            y=[current_tide],
-            mode='markers',
-            marker=dict(color=self.tide_colors["current"], size=10),
-            name='Current Time'
-        ))
-        
-        # Update layout
-        fig.update_layout(
-            title='Tide Pattern (24-hour cycle)',
-            xaxis_title='Hours',
-            yaxis_title='Tide Level (m)',
-            width=600,
-            height=400,
-            margin=dict(l=50, r=50, t=50, b=50),
-            hovermode='x unified'
-        )
+        return self._build_tide_visual(datetime.now().hour)
+
+    @lru_cache(maxsize=24)
+    def _build_tide_visual(self, current_time: int) -> Dict[str, Any]:
+        """
+        Build the tide figure, memoized per hour of the day
+        """
+        high_tide = self._high_tide
+        low_tide = self._low_tide
+        current_tide = 1.5 * sin(2*pi*current_time/12) + 1.5 * sin(2*pi*current_time/24)
         
-        return fig.to_dict()
+        return {
+            "data": [
+                # Tide line
+                {
+                    "type": "scatter",
+                    "x": self._x,
+                    "y": self._y,
+                    "mode": "lines",
+                    "line": {"color": "#0066cc", "width": 2},
+                    "name": "Tide Level"
+                },
+                # High and low tide markers
+                {
+                    "type": "scatter",
+                    "x": [0, 24],
+                    "y": [high_tide, high_tide],
+                    "mode": "lines",
+                    "line": {"color": self.tide_colors["high"], "dash": "dash"},
+                    "name": "High Tide"
+                },
+                {
+                    "type": "scatter",
+                    "x": [0, 24],
+                    "y": [low_tide, low_tide],
+                    "mode": "lines",
+                    "line": {"color": self.tide_colors["low"], "dash": "dash"},
+                    "name": "Low Tide"
+                },
+                # Current time marker
+                {
+                    "type": "scatter",
+                    "x": [current_time],
+                    "y": [current_tide],
+                    "mode": "markers",
+                    "marker": {"color": self.tide_colors["current"], "size": 10},
+                    "name": "Current Time"
+                }
+            ],
+            "layout": {
+                "title": {"text": "Tide Pattern (24-hour cycle)"},
+                "xaxis": {"title": {"text": "Hours"}},
+                "yaxis": {"title": {"text": "Tide Level (m)"}},
+                "width": 600,
+                "height": 400,
+                "margin": {"l": 50, "r": 50, "t": 50, "b": 50},
+                "hovermode": "x unified"
+            }
+        }
 
 class SefirotVisualization:
     def __init__(self):
@@ -179,15 +227,8 @@ class SefirotVisualization:
             "Yesod": "#808080",
             "Malchut": "#ffffff"
         }
-
-    def create_sefirot_tree(self, highlighted_sefirot: list = None) -> Dict[str, Any]:
-        """
-        Create a visualization of the Tree of Life with highlighted sefirot
-        """
-        fig = go.Figure()
         
-        # Add connections
-        connections = [
+        self.connections = (
             ("Keter", "Chochmah"), ("Keter", "Binah"),
             ("Chochmah", "Binah"),
             ("Chochmah", "Chesed"), ("Binah", "Gevurah"),
@@ -197,54 +238,76 @@ class SefirotVisualization:
             ("Netzach", "Hod"),
             ("Netzach", "Yesod"), ("Hod", "Yesod"),
             ("Yesod", "Malchut")
-        ]
+        )
         
-        for start, end in connections:
+        # The tree layout is fixed, so resolve edge and node coordinates once
+        self._edge_x = []
+        self._edge_y = []
+        for start, end in self.connections:
             x0, y0 = self.sefirot_positions[start]
             x1, y1 = self.sefirot_positions[end]
-            fig.add_trace(go.Scatter(
-                x=[x0, x1],
-                y=[y0, y1],
-                mode='lines',
-                line=dict(color='black', width=1),
-                showlegend=False
-            ))
-        
-        # Add sefirot
-        for sefira in self.sefirot_positions:
-            x, y = self.sefirot_positions[sefira]
-            color = self.sefirot_colors[sefira]
-            
-            # Highlight if needed
-            if highlighted_sefirot and sefira in highlighted_sefirot:
-                color = '#ff0000'
-                size = 15
-            else:
-                size = 10
-            
-            fig.add_trace(go.Scatter(
-                x=[x],
-                y=[y],
-                mode='markers+text',
-                marker=dict(color=color, size=size),
-                text=[sefira],
-                textposition='middle right',
-                textfont=dict(color='black', size=12),
-                showlegend=False
-            ))
+            self._edge_x += [x0, x1, None]
+            self._edge_y += [y0, y1, None]
         
-        # Update layout
-        fig.update_layout(
-            width=800,
-            height=600,
-            showlegend=False,
-            xaxis=dict(visible=False),
-            yaxis=dict(visible=False),
-            margin=dict(l=50, r=50, t=50, b=50),
-            title='Tree of Life (Etz Chaim)'
-        )
+        self._node_names = list(self.sefirot_positions)
+        self._node_x = [self.sefirot_positions[sefira][0] for sefira in self._node_names]
+        self._node_y = [self.sefirot_positions[sefira][1] for sefira in self._node_names]
+        self._base_colors = [self.sefirot_colors[sefira] for sefira in self._node_names]
+
+    def create_sefirot_tree(self, highlighted_sefirot: list = None) -> Dict[str, Any]:
+        """
+        Create a visualization of the Tree of Life with highlighted sefirot
+        """
+        return self._build_sefirot_tree(tuple(sorted(highlighted_sefirot or ())))
+
+    @lru_cache(maxsize=64)
+    def _build_sefirot_tree(self, highlighted_sefirot: Tuple[str, ...]) -> Dict[str, Any]:
+        """
+        Build the Tree of Life figure, memoized per set of highlighted sefirot
+        """
+        highlighted = set(highlighted_sefirot)
+        names = self._node_names
         
-        return fig.to_dict()
+        return {
+            "data": [
+                # All connections as one trace, with None breaking the line between them
+                {
+                    "type": "scatter",
+                    "x": self._edge_x,
+                    "y": self._edge_y,
+                    "mode": "lines",
+                    "line": {"color": "black", "width": 1},
+                    "showlegend": False
+                },
+                # Sefirot as one trace, highlighting if needed
+                {
+                    "type": "scatter",
+                    "x": self._node_x,
+                    "y": self._node_y,
+                    "mode": "markers+text",
+                    "marker": {
+                        "color": [
+                            '#ff0000' if sefira in highlighted else color
+                            for sefira, color in zip(names, self._base_colors)
+                        ],
+                        "size": [15 if sefira in highlighted else 10 for sefira in names]
+                    },
+                    "text": names,
+                    "textposition": "middle right",
+                    "textfont": {"color": "black", "size": 12},
+                    "showlegend": False
+                }
+            ],
+            "layout": {
+                "width": 800,
+                "height": 600,
+                "showlegend": False,
+                "xaxis": {"visible": False},
+                "yaxis": {"visible": False},
+                "margin": {"l": 50, "r": 50, "t": 50, "b": 50},
+                "title": {"text": "Tree of Life (Etz Chaim)"}
+            }
+        }
 
 # Create singleton instances
 moon_visualizer = MoonVisualization()
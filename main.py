@@ -1,13 +1,15 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from datetime import datetime, timedelta, date
+from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
 import requests
 from astral.sun import sun
 from astral import LocationInfo
 import pytz
 
-app = FastAPI(title="Jewish Spiritual Companion")
+app = FastAPI(title="Jewish Spiritual Companion", default_response_class=ORJSONResponse)
 
 class PrayerTimes(BaseModel):
     sunrise: str
@@ -29,18 +31,30 @@ class AstronomicalData(BaseModel):
     tide: str
     mazalot: str
 
+# Times are given in Israel time, so only coordinates in and around Israel are supported
+ISRAEL_LATITUDES = (29.4, 33.4)
+ISRAEL_LONGITUDES = (34.2, 35.95)
+
+@lru_cache(maxsize=4096)
+def _sun_cached(latitude: float, longitude: float, day: date) -> Tuple[str, str]:
+    """Sunrise and sunset in Israel time for a location and day"""
+    location = LocationInfo("", "Israel", "Asia/Jerusalem", latitude, longitude)
+    s = sun(location.observer, date=day, tzinfo=location.tzinfo)
+    return s["sunrise"].strftime("%H:%M"), s["sunset"].strftime("%H:%M")
+
 @app.get("/prayer-times/{latitude}/{longitude}", response_model=PrayerTimes)
-async def get_prayer_times(latitude: float, longitude: float):
+def get_prayer_times(latitude: float, longitude: float):
     """Calculate daily prayer times based on location"""
-    location = LocationInfo("", "", "Israel", "Asia/Jerusalem")
-    location.latitude = latitude
-    location.longitude = longitude
+    if not (ISRAEL_LATITUDES[0] <= latitude <= ISRAEL_LATITUDES[1]
+            and ISRAEL_LONGITUDES[0] <= longitude <= ISRAEL_LONGITUDES[1]):
+        raise HTTPException(status_code=400, detail="Prayer times are only available for locations in Israel")
     
-    s = sun(location.observer, date=datetime.now())
+    # Round to ~100m so nearby devices share a cache entry
+    sunrise, sunset = _sun_cached(round(latitude, 3), round(longitude, 3), datetime.now().date())
     
     return PrayerTimes(
-        sunrise=s.sunrise().strftime("%H:%M"),
-        sunset=s.sunset().strftime("%H:%M"),
+        sunrise=sunrise,
+        sunset=sunset,
         shacharit="08:00",  # Adjust based on sunrise
         mincha="16:00",     # Adjust based on sunset
         maariv="19:00",     # Adjust based on sunset
@@ -81,11 +95,14 @@ async def get_practical_reminders():
     current_date = datetime.now()
     
     # Example reminders
+    today = []
+    if current_date.weekday() == 4:
+        today.append("Prepare challah for Shabbat")
+    if current_date.month == 7:
+        today.append("Hydrate well today as we approach Tisha B'Av")
+    
     reminders = {
-        "today": [
-            "Prepare challah for Shabbat" if current_date.weekday() == 4 else None,
-            "Hydrate well today as we approach Tisha B'Av" if current_date.month == 7 else None
-        ],
+        "today": today,
         "this_week": [
             "Plan your Shabbat menu",
             "Review this week's parsha"
@@ -93,5 +110,5 @@ async def get_practical_reminders():
     }
     
     return {
-        "reminders": {k: [r for r in v if r] for k, v in reminders.items()}
+        "reminders": reminders
     }
@@ -0,0 +1,55 @@
+"""
+Render the static moon phase and tide images served by the torah endpoints.
+
+Run from the repository root: python -m scripts.render_static_visuals
+(install requirements-dev.txt first for matplotlib)
+"""
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from app.utils.visualizations import STATIC_DIR, TIDE_IMAGE_PATH, moon_image_path, moon_visualizer, tide_visualizer
+
+def render_moon(phase_name: str, phase: float) -> None:
+    """
+    Render one moon phase with its outline and illuminated arc, labelled by name only
+    """
+    # Draw the same outline and arc as the Plotly figure so the two stay in sync
+    outline, illuminated = moon_visualizer.create_moon_visual(phase, phase_name)["data"]
+
+    fig, ax = plt.subplots(figsize=(3, 3), dpi=100)
+    ax.plot(outline["x"], outline["y"], color="black", linewidth=2)
+    ax.fill(illuminated["x"], illuminated["y"], color=illuminated["fillcolor"])
+    # The image is served for any day in the phase, so it carries no illumination percentage
+    ax.text(0, 0, phase_name, ha="center", va="center", fontsize=14)
+    ax.set_aspect("equal")
+    ax.axis("off")
+    fig.savefig(moon_image_path(phase_name), bbox_inches="tight")
+    plt.close(fig)
+
+def render_tide() -> None:
+    """
+    Render the 24-hour tide cycle with its high and low marks
+    """
+    # Reuse the tide visualizer's curve and marks so the image matches the Plotly figure
+    tide, high, low, _current = tide_visualizer.create_tide_visual({})["data"]
+
+    fig, ax = plt.subplots(figsize=(6, 4), dpi=100)
+    ax.plot(tide["x"], tide["y"], color=tide["line"]["color"], linewidth=2, label=tide["name"])
+    ax.axhline(high["y"][0], color=high["line"]["color"], linestyle="--", label=high["name"])
+    ax.axhline(low["y"][0], color=low["line"]["color"], linestyle="--", label=low["name"])
+    ax.set_title("Tide Pattern (24-hour cycle)")
+    ax.set_xlabel("Hours")
+    ax.set_ylabel("Tide Level (m)")
+    ax.legend()
+    fig.savefig(TIDE_IMAGE_PATH, bbox_inches="tight")
+    plt.close(fig)
+
+def main() -> None:
+    STATIC_DIR.mkdir(exist_ok=True)
+    # Size each arc at the middle of its eighth of the cycle
+    for index, phase_name in enumerate(moon_visualizer.phase_colors):
+        render_moon(phase_name, (index + 0.5) * 100 / 8)
+    render_tide()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+from datetime import datetime
+from app.utils.astronomy import calculate_prayer_times
+
+def test_prayer_times_are_local():
+    # Jerusalem sunrise on the June solstice is around 05:33 local time (02:33 UTC)
+    times = calculate_prayer_times(datetime(2026, 6, 21), 31.7683, 35.2137)
+    assert "05:00" < times["sunrise"] < "06:00"
+    assert "19:00" < times["sunset"] < "20:30"
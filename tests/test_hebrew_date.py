@@ -0,0 +1,29 @@
+from datetime import datetime
+from app.utils import hebrew_date
+from app.utils.hebrew_date import HebrewDateCalculator
+
+def test_hebrew_date():
+    calculator = HebrewDateCalculator()
+    result = calculator.get_hebrew_date(datetime(2026, 4, 3))
+    assert (result["hebrew_year"], result["hebrew_month_name"], result["hebrew_day"]) == (5786, "Nisan", 16)
+    assert result["is_holiday"] is True
+    assert result["day_of_week"] == "Yom Shishi"
+
+def test_failing_day_does_not_break_year(monkeypatch):
+    real_from_rd = hebrew_date.HebrewDate.from_rd
+    bad_day = datetime(2031, 12, 1).toordinal()
+    calls = []
+
+    def from_rd(rd):
+        calls.append(rd)
+        if rd == bad_day:
+            raise ValueError("bad day")
+        return real_from_rd(rd)
+
+    monkeypatch.setattr(hebrew_date.HebrewDate, "from_rd", from_rd)
+    calculator = HebrewDateCalculator()
+
+    assert calculator.get_hebrew_date(datetime(2031, 12, 1)) == {"error": "bad day"}
+    assert calculator.get_hebrew_date(datetime(2031, 12, 2))["gregorian_date"] == "2031-12-02"
+    # The year is converted once and the table is reused despite the failing day
+    assert calls.count(datetime(2031, 12, 2).toordinal()) == 1
@@ -0,0 +1,12 @@
+from fastapi.testclient import TestClient
+import main
+
+client = TestClient(main.app)
+
+def test_prayer_times():
+    response = client.get("/prayer-times/31.7683/35.2137")
+    assert response.status_code == 200
+    assert response.json()["sunrise"] < response.json()["sunset"]
+
+def test_prayer_times_outside_israel():
+    assert client.get("/prayer-times/40.7/-74").status_code == 400
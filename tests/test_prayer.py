@@ -0,0 +1,16 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1.api import api_router
+
+app = FastAPI()
+app.include_router(api_router, prefix="/api/v1")
+client = TestClient(app)
+
+def test_daily_schedule():
+    response = client.get("/api/v1/prayer/daily-schedule", params={"latitude": 31.7683, "longitude": 35.2137, "date": "2026-06-21"})
+    assert response.status_code == 200
+    assert response.json()["prayer_times"]["sunrise"] == "05:34"
+
+def test_daily_schedule_outside_israel():
+    response = client.get("/api/v1/prayer/daily-schedule", params={"latitude": 40.7, "longitude": -74})
+    assert response.status_code == 400
@@ -0,0 +1,16 @@
+import asyncio
+import json
+from datetime import datetime
+from app.utils.sefaria import SefariaAPI
+
+def test_malformed_json_becomes_error(monkeypatch):
+    api = SefariaAPI()
+
+    async def get_json(url, params):
+        raise json.JSONDecodeError("Expecting value", "<html>", 0)
+
+    monkeypatch.setattr(api, "_get_json", get_json)
+    texts = asyncio.run(api.get_related_texts("Torah.Bereshit"))
+    assert "error" in texts["rashi"]
+    assert "error" in texts["kabbalistic"]["zohar"]
+    assert "error" in asyncio.run(api.get_parsha(datetime(2026, 6, 21)))
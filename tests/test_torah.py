@@ -0,0 +1,52 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from app.api.v1.api import api_router
+from app.api.v1.endpoints import torah
+
+app = FastAPI()
+app.include_router(api_router, prefix="/api/v1")
+client = TestClient(app)
+
+@pytest.fixture
+def stub_sefaria(monkeypatch):
+    async def get_parsha(date):
+        return {"parsha": "Bereshit"}
+
+    async def get_related_texts(ref):
+        return {"rashi": {"text": "Chesed and gevurah meet in tiferet"}}
+
+    monkeypatch.setattr(torah.sefaria_api, "get_parsha", get_parsha)
+    monkeypatch.setattr(torah.sefaria_api, "get_related_texts", get_related_texts)
+    torah.sefaria_cache.clear()
+    yield
+    torah.sefaria_cache.clear()
+
+def test_weekly_parsha_registered_once():
+    assert len([r for r in torah.router.routes if r.path == "/weekly-parsha"]) == 1
+
+def test_weekly_parsha(stub_sefaria):
+    response = client.get("/api/v1/torah/weekly-parsha")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["parsha_name"] == "Bereshit"
+    assert data["visualizations"]["moon"]["data"]
+    assert data["visualizations"]["tide"]["data"]
+
+def test_weekly_parsha_lookup_error(monkeypatch):
+    async def get_parsha(date):
+        return {"error": "Sefaria unavailable"}
+
+    async def get_related_texts(ref):
+        raise AssertionError("texts fetched without a parsha")
+
+    monkeypatch.setattr(torah.sefaria_api, "get_parsha", get_parsha)
+    monkeypatch.setattr(torah.sefaria_api, "get_related_texts", get_related_texts)
+    torah.sefaria_cache.clear()
+
+    response = client.get("/api/v1/torah/weekly-parsha")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["parsha_name"] == ""
+    assert "error" in data
+    assert len(torah.sefaria_cache) == 0